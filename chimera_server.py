@@ -13,30 +13,47 @@
 # limitations under the License.
 
 import argparse
-import json
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from typing import Any, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Union
+
+import orjson
 
 try:
-    from fastapi import FastAPI, HTTPException
-    from pydantic import BaseModel
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.responses import ORJSONResponse
+    from pydantic import BaseModel, TypeAdapter, ValidationError
 except ImportError:  # FastAPI optional unless HTTP mode enabled
     FastAPI = None
     BaseModel = None
 
 from src.vee.backend import ChimeraBackend
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    stream=sys.stderr,
-)
+# Records are formatted and written to stderr by a background listener thread, so request
+# threads (which may hold the backend lock) never block on the stderr pipe.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _stderr_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Full format applied by the listener
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger("chimera.backend.server")
 
 logger.info("CHIMERA Backend Server script started.")
 
+STDIO_WORKERS = int(os.getenv("CHIMERA_STDIO_WORKERS", "8"))
+
 try:
     backend = ChimeraBackend()
     logger.info("ChimeraBackend initialized successfully.")
@@ -45,12 +62,12 @@ except Exception as e:
     backend = None
 
 
-def handle_json_line(line: str) -> Dict[str, Any]:
+def handle_json_line(line: Union[str, bytes]) -> Dict[str, Any]:
     if not backend:
         return {"jsonrpc": "2.0", "id": None, "error": {"code": -32000, "message": "Backend not initialized."}}
     try:
-        request = json.loads(line)
-    except json.JSONDecodeError:
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError:
         return {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Invalid JSON"}}
 
     return backend.handle_request(request)
@@ -58,13 +75,29 @@ def handle_json_line(line: str) -> Dict[str, Any]:
 
 def run_stdio_server():
     logger.info("CHIMERA backend starting in STDIO mode")
-    while True:
-        line = sys.stdin.readline()
-        if not line:
-            break
-        response = handle_json_line(line)
-        sys.stdout.write(json.dumps(response) + "\n")
-        sys.stdout.flush()
+    write_lock = threading.Lock()
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
+    def respond(line: bytes):
+        try:
+            response = handle_json_line(line)
+        except Exception:
+            logger.exception("Unhandled error while serving request")
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": -32603, "message": "Internal error"}}
+        payload = orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE)
+        with write_lock:
+            stdout.write(payload)
+            stdout.flush()
+
+    # Replies are matched by JSON-RPC id upstream, so requests are served concurrently
+    # and parallel tool calls from the agent do not queue behind each other.
+    with ThreadPoolExecutor(max_workers=STDIO_WORKERS, thread_name_prefix="chimera-stdio") as pool:
+        while True:
+            line = stdin.readline()
+            if not line:
+                break
+            pool.submit(respond, line)
 
 
 # --- FastAPI HTTP surface ----------------------------------------------------
@@ -77,10 +110,14 @@ if FastAPI:
         method: str
         params: Dict[str, Any] = {}
 
+    # Validates the raw request body in one pass, without an intermediate stdlib json decode
+    MCP_REQUEST_ADAPTER = TypeAdapter(MCPRequest)
+
     app = FastAPI(
         title="CHIMERA Secure Backend",
         description="Production vs Honeypot data plane exposed over HTTP.",
         version="0.1.0",
+        default_response_class=ORJSONResponse,
     )
 
     @app.on_event("startup")
@@ -88,11 +125,19 @@ if FastAPI:
         logger.info("FastAPI app startup complete. Ready to serve requests.")
 
     @app.post("/mcp")
-    async def mcp_bridge(payload: MCPRequest):
+    async def mcp_bridge(request: Request):
         if not backend:
             raise HTTPException(status_code=503, detail="Backend not available.")
         try:
-            response = backend.handle_request(payload.dict())
+            payload = MCP_REQUEST_ADAPTER.validate_json(await request.body())
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=422, detail=exc.errors(include_url=False, include_context=False, include_input=False)
+            ) from exc
+        try:
+            # handle_request blocks (stealth jitter, SQLite); keep it off the event loop so
+            # concurrent requests overlap instead of queueing behind each other
+            response = await run_in_threadpool(backend.handle_request, payload.model_dump())
             return response
         except Exception as exc:  # pragma: no cover - FastAPI auto handling
             raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -111,6 +156,12 @@ def parse_args():
     )
     parser.add_argument("--host", default=os.getenv("CHIMERA_SERVER_HOST", "0.0.0.0"))
     parser.add_argument("--port", type=int, default=int(os.getenv("CHIMERA_SERVER_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("CHIMERA_SERVER_WORKERS", "1")),
+        help="Uvicorn worker processes for HTTP mode (each loads its own backend).",
+    )
     return parser.parse_args()
 
 
@@ -125,7 +176,16 @@ if __name__ == "__main__":
             sys.exit(1)
         import uvicorn
 
-        logger.info(f"Starting Uvicorn server on {args.host}:{args.port}")
-        uvicorn.run("chimera_server:app", host=args.host, port=args.port, log_level="info")
+        logger.info(f"Starting Uvicorn server on {args.host}:{args.port} ({args.workers} worker(s))")
+        # loop/http "auto" resolve to uvloop and httptools when installed (uvicorn[standard])
+        uvicorn.run(
+            "chimera_server:app",
+            host=args.host,
+            port=args.port,
+            log_level="info",
+            loop="auto",
+            http="auto",
+            workers=args.workers,
+        )
     else:
         run_stdio_server()
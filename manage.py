@@ -15,15 +15,22 @@
 import argparse
 import re
 import yaml
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed parser
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
 PROJECT_ROOT = Path(__file__).resolve().parent
 REGISTRY_PATH = PROJECT_ROOT / "scenarios" / "registry.yaml"
+NAME_SEPARATORS = re.compile(r"[-_\s]+")
 
 
+@lru_cache(maxsize=256)
 def camelize(name: str) -> str:
-    parts = re.split(r"[-_\\s]+", name)
-    return "".join(part.capitalize() for part in parts if part)
+    return "".join(part.capitalize() for part in NAME_SEPARATORS.split(name) if part)
 
 
 def scaffold_scenario(name: str) -> None:
@@ -132,7 +139,7 @@ def list_scenarios() -> None:
         return
     
     with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-        registry = yaml.safe_load(f) or {}
+        registry = yaml.load(f, Loader=YamlLoader) or {}
     
     scenarios = registry.get("scenarios", {})
     if not scenarios:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
@@ -23,6 +24,9 @@ from scripts.seeders.base import BaseSeeder
 class AetheriaSeeder(BaseSeeder):
     """Seeder for the Aetheria Genesis demo scenario."""
 
+    _BASES = ("A", "T", "G", "C")
+    _CODONS = 12
+
     def __init__(self, assets_dir: Path):
         super().__init__(assets_dir)
         self._faker = Faker()
@@ -41,10 +45,12 @@ class AetheriaSeeder(BaseSeeder):
         private_dir = self.assets_dir / "private"
         if not private_dir.exists():
             return []
-        files = sorted(private_dir.glob("*"))
-        for file_path in files:
-            content = file_path.read_text(encoding="utf-8")
-            resource_path = f"/data/private/{file_path.name}"
+        # scandir's cached entry types avoid a stat per file; subdirectories are skipped
+        with os.scandir(private_dir) as entries:
+            files = sorted((entry for entry in entries if entry.is_file()), key=lambda entry: entry.name)
+        for entry in files:
+            content = Path(entry.path).read_text(encoding="utf-8")
+            resource_path = f"/data/private/{entry.name}"
             yield resource_path, content
 
     # --- Honeypot generation ---------------------------------------------
@@ -67,11 +73,9 @@ class AetheriaSeeder(BaseSeeder):
     # --- Helpers ----------------------------------------------------------
 
     def _fake_formula(self) -> str:
-
-        triplets = []
-        for _ in range(12):
-            triplets.append("".join(self._faker.random_choices(elements=list("ATGC"), length=3)))
-        seq = "-".join(triplets)
+        # One draw from Faker's RNG for every codon, so Faker.seed() still reproduces it
+        picks = self._faker.random.choices(self._BASES, k=self._CODONS * 3)
+        seq = "-".join("".join(picks[i:i + 3]) for i in range(0, len(picks), 3))
         data = {
             "project": "Chimera-SHADOW",
             "sequence_id": f"FAKE-{self._faker.random_int(200, 999)}",
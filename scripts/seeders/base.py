@@ -15,8 +15,33 @@
 from __future__ import annotations
 
 import shutil
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl that clones a whole file copy-on-write (btrfs, XFS with reflink, ...)
+_FICLONE = 0x40049409
+# Cleared after the first refusal so unsupported filesystems pay for the attempt only once
+_reflink_enabled = fcntl is not None and sys.platform.startswith("linux")
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """copytree copy_function: reflink the file where supported, else copy it normally."""
+    global _reflink_enabled
+    if _reflink_enabled:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            _reflink_enabled = False
+    return shutil.copy2(src, dst)
 
 
 class BaseSeeder:
@@ -50,6 +75,14 @@ class BaseSeeder:
         """Generate a synthetic patient record for the honeypot DB."""
         raise NotImplementedError
 
+    def shadow_patients(self, patient_ids: Iterable[int]) -> List[Dict[str, str]]:
+        """
+        Generate synthetic records for many patients at once, in input order.
+        Defaults to one shadow_patient call per id; seeders producing large
+        populations can override this to draw their fake data in bulk.
+        """
+        return [self.shadow_patient(patient_id) for patient_id in patient_ids]
+
     def shadow_confidential(self, resource_path: str, prod_content: str) -> str:
         """Return fake content for a confidential file."""
         raise NotImplementedError
@@ -60,6 +93,8 @@ class BaseSeeder:
         """
         Copy / synthesize filesystem artifacts into runtime data roots.
         Default implementation copies entire assets directories if present.
+        Files are cloned rather than hardlinked: the runtime shadow tree is rewritten
+        after seeding and must not alias the scenario's assets.
         """
         runtime_data_dir.mkdir(parents=True, exist_ok=True)
         for subdir in ("real", "shadow", "shared", "private"):
@@ -68,7 +103,7 @@ class BaseSeeder:
             if dst.exists():
                 shutil.rmtree(dst)
             if src.exists():
-                shutil.copytree(src, dst)
+                shutil.copytree(src, dst, copy_function=_clone_file)
             else:
                 dst.mkdir(parents=True, exist_ok=True)
 
@@ -24,11 +24,13 @@ from __future__ import annotations
 
 import argparse
 import importlib
+import itertools
 import os
 import sqlite3
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Set, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -55,6 +57,25 @@ CREATE TABLE IF NOT EXISTS confidential_files (
 """
 
 
+# WAL is persisted in the database file, so the backend's connections use it as well
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-200000;
+"""
+
+
+def open_db(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+
+# Threads writing shadow artifacts while the seeding thread fakes content and inserts rows
+ARTIFACT_WRITERS = 8
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sync production/shadow databases.")
     parser.add_argument(
@@ -96,113 +117,158 @@ def ensure_runtime_dirs():
         (DATA_DIR / sub).mkdir(parents=True, exist_ok=True)
 
 
-def init_prod_db(seeder: BaseSeeder, confidential_files: List[Tuple[str, str]]) -> None:
+def init_prod_db(seeder: BaseSeeder, confidential_files: Iterable[Tuple[str, str]]) -> List[int]:
+    """Load production data and return the loaded patient ids in ascending order."""
     print(f"[+] Ensuring production DB at {PROD_DB}")
-    conn = sqlite3.connect(PROD_DB)
+    conn = open_db(PROD_DB)
     cur = conn.cursor()
     cur.executescript(SCHEMA_SQL)
 
     real_data = seeder.real_patients()
-    cur.execute("DELETE FROM patients")
-    for pid, record in real_data.items():
-        cur.execute(
+    # One transaction for the whole load: committed once, rolled back on any error.
+    # BEGIN is explicit because sqlite3 would run the DROP INDEX statements in autocommit,
+    # leaving prod.db without its indexes if the load then failed.
+    with conn:
+        cur.execute("BEGIN")
+        index_ddl = _drop_indexes(cur, ("patients", "confidential_files"))
+        cur.execute("DELETE FROM patients")
+        cur.executemany(
             "INSERT INTO patients (patient_id, name, diagnosis, ssn) VALUES (?, ?, ?, ?)",
-            (int(pid), record.get("name"), record.get("diagnosis"), record.get("ssn")),
+            (
+                (int(pid), record.get("name"), record.get("diagnosis"), record.get("ssn"))
+                for pid, record in real_data.items()
+            ),
         )
 
-    cur.execute("DELETE FROM confidential_files")
-    for path, content in confidential_files:
-        cur.execute(
+        cur.execute("DELETE FROM confidential_files")
+        # Streamed straight from the seeder, so only one file's content is held at a time
+        cur.executemany(
             "INSERT INTO confidential_files (path, content) VALUES (?, ?)",
-            (path, content),
+            confidential_files,
         )
-
-    conn.commit()
+        file_count = cur.rowcount
+        # Building each index once over the loaded rows beats updating it per insert
+        for ddl in index_ddl:
+            cur.execute(ddl)
+    if index_ddl:
+        cur.execute("ANALYZE")
     conn.close()
     print(
-        f"[+] Production DB populated with {len(real_data)} patient records and {len(confidential_files)} confidential files"
+        f"[+] Production DB populated with {len(real_data)} patient records and {file_count} confidential files"
     )
+    return sorted(int(pid) for pid in real_data)
+
+
+def _drop_indexes(cur: sqlite3.Cursor, tables: Tuple[str, ...]) -> List[str]:
+    """Drop the explicit indexes on ``tables`` and return their CREATE statements."""
+    placeholders = ", ".join("?" for _ in tables)
+    rows = cur.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+        tables,
+    ).fetchall()
+    for name, _ in rows:
+        cur.execute(f'DROP INDEX "{name}"')
+    return [ddl for _, ddl in rows]
 
 
 def clone_schema():
     print("[+] Cloning schema to shadow DB")
-    prod_conn = sqlite3.connect(PROD_DB)
-    shadow_conn = sqlite3.connect(SHADOW_DB)
-    prod_cur = prod_conn.cursor()
+    shadow_conn = open_db(SHADOW_DB)
     shadow_cur = shadow_conn.cursor()
 
+    # Read the production DDL through ATTACH: no second connection, one query for every table.
+    # The stored CREATE statements are replayed rather than CREATE TABLE ... AS SELECT,
+    # which would drop the primary keys and NOT NULL constraints.
+    tables = ("patients", "confidential_files")
+    shadow_cur.execute("ATTACH DATABASE ? AS src", (str(PROD_DB),))
+    placeholders = ", ".join("?" for _ in tables)
+    ddl = dict(
+        shadow_cur.execute(
+            f"SELECT name, sql FROM src.sqlite_master WHERE type='table' AND name IN ({placeholders})", tables
+        ).fetchall()
+    )
+    shadow_cur.execute("DETACH DATABASE src")
+
     shadow_cur.execute("PRAGMA foreign_keys=OFF;")
     shadow_cur.execute("BEGIN TRANSACTION;")
-    for table in ("patients", "confidential_files"):
+    for table in tables:
         shadow_cur.execute(f"DROP TABLE IF EXISTS {table};")
-        row = prod_cur.execute(
-            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
-        ).fetchone()
-        if row and row[0]:
-            shadow_cur.execute(row[0])
+        if ddl.get(table):
+            shadow_cur.execute(ddl[table])
     shadow_conn.commit()
-    prod_conn.close()
     shadow_conn.close()
     print("[+] Schema clone complete")
 
 
-def seed_shadow(seeder: BaseSeeder, confidential_files: List[Tuple[str, str]]) -> None:
+def seed_shadow(
+    seeder: BaseSeeder, patient_ids: List[int], confidential_files: Iterable[Tuple[str, str]]
+) -> None:
     print("[+] Seeding shadow DB with synthetic data")
-    prod_conn = sqlite3.connect(PROD_DB)
-    shadow_conn = sqlite3.connect(SHADOW_DB)
-    prod_cur = prod_conn.cursor()
+    shadow_conn = open_db(SHADOW_DB)
     shadow_cur = shadow_conn.cursor()
 
-    shadow_cur.execute("DELETE FROM patients")
-    shadow_cur.execute("DELETE FROM confidential_files")
-
-    rows = prod_cur.execute("SELECT patient_id FROM patients ORDER BY patient_id").fetchall()
-    for row in rows:
-        pid = row[0]
-        fake_record = seeder.shadow_patient(pid)
-        shadow_cur.execute(
+    fake_patients = [
+        (
+            fake_record.get("patient_id", pid),
+            fake_record.get("name"),
+            fake_record.get("diagnosis"),
+            fake_record.get("ssn"),
+        )
+        for pid, fake_record in zip(patient_ids, seeder.shadow_patients(patient_ids))
+    ]
+
+    writes: List[Future] = []
+    # Artifact directories created by this run; saves a mkdir per file. Kept per call because
+    # materialize_filesystems may delete the shadow tree between runs in one process.
+    created_dirs: Set[Path] = set()
+
+    def shadow_entries(writer: ThreadPoolExecutor) -> Iterator[Tuple[str, str]]:
+        # Files are faked one at a time as the insert consumes them; disk writes overlap on the pool
+        for resource_path, prod_content in confidential_files:
+            fake_content = seeder.shadow_confidential(resource_path, prod_content)
+            writes.append(writer.submit(_write_shadow_artifact, resource_path, fake_content, created_dirs))
+            yield resource_path, fake_content
+
+    # One transaction for the whole load: committed once, rolled back on any error
+    with shadow_conn, ThreadPoolExecutor(max_workers=ARTIFACT_WRITERS) as writer:
+        shadow_cur.execute("DELETE FROM patients")
+        shadow_cur.execute("DELETE FROM confidential_files")
+        shadow_cur.executemany(
             "INSERT INTO patients (patient_id, name, diagnosis, ssn) VALUES (?, ?, ?, ?)",
-            (
-                fake_record.get("patient_id", pid),
-                fake_record.get("name"),
-                fake_record.get("diagnosis"),
-                fake_record.get("ssn"),
-            ),
+            fake_patients,
         )
-
-    shadow_entries = []
-    for resource_path, prod_content in confidential_files:
-        fake_content = seeder.shadow_confidential(resource_path, prod_content)
-        shadow_entries.append((resource_path, fake_content))
-        _write_shadow_artifact(resource_path, fake_content)
-
-    shadow_cur.executemany(
-        "INSERT INTO confidential_files (path, content) VALUES (?, ?)",
-        shadow_entries,
-    )
-
-    shadow_conn.commit()
-    prod_conn.close()
+        shadow_cur.executemany(
+            "INSERT INTO confidential_files (path, content) VALUES (?, ?)",
+            shadow_entries(writer),
+        )
+        file_count = shadow_cur.rowcount
+        for write in writes:
+            write.result()  # A failed artifact write rolls the load back, as before
     shadow_conn.close()
-    print(f"[+] Shadow DB seeded with {len(rows)} fake patient records and {len(shadow_entries)} confidential files")
+    print(f"[+] Shadow DB seeded with {len(fake_patients)} fake patient records and {file_count} confidential files")
 
 
-def _write_shadow_artifact(resource_path: str, content: str) -> None:
+def _write_shadow_artifact(resource_path: str, content: str, created_dirs: Set[Path]) -> None:
     """Drop honeypot content into the runtime shadow filesystem for quick inspection."""
     rel_path = resource_path
     if rel_path.startswith("/data/"):
         rel_path = rel_path[len("/data/") :]
     rel = Path(rel_path.lstrip("/\\"))
     target = DATA_DIR / "shadow" / rel
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(content, encoding="utf-8")
+    parent = target.parent
+    if parent not in created_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        created_dirs.add(parent)
+    target.write_bytes(content.encode("utf-8"))
 
 
-def collect_confidential_sources(seeder: BaseSeeder) -> List[Tuple[str, str]]:
-    sources = list(seeder.confidential_sources())
-    if not sources:
+def collect_confidential_sources(seeder: BaseSeeder) -> Iterator[Tuple[str, str]]:
+    sources = iter(seeder.confidential_sources())
+    first = next(sources, None)
+    if first is None:
         print("[!] WARNING: no confidential assets found for production DB.")
-    return sources
+        return iter(())
+    return itertools.chain((first,), sources)
 
 
 def main():
@@ -213,10 +279,9 @@ def main():
     ensure_runtime_dirs()
     seeder.materialize_filesystems(DATA_DIR)
 
-    confidential_files = collect_confidential_sources(seeder)
-    init_prod_db(seeder, confidential_files)
+    patient_ids = init_prod_db(seeder, collect_confidential_sources(seeder))
     clone_schema()
-    seed_shadow(seeder, confidential_files)
+    seed_shadow(seeder, patient_ids, seeder.confidential_sources())
     print(f"[OK] Shadow synchronization complete (scenario={settings.get('scenario', {}).get('active')})")
 
 
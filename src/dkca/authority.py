@@ -17,11 +17,26 @@ import jwt
 import time
 import uuid
 import logging
+from functools import cache
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
 logger = logging.getLogger(__name__)
 
 KEY_DIR = "keys"
 
+# Static JWT headers; PyJWT copies them into its own header dict, so sharing is safe
+PRIME_HEADERS = {"kid": "prime_key_1"}
+SHADOW_HEADERS = {"kid": "shadow_key_1"}
+
+
+@cache
+def _load_signing_key(path: str) -> RSAPrivateKey:
+    """Read and parse a PEM private key once per process; later authorities share the object."""
+    with open(path, "rb") as f:
+        return load_pem_private_key(f.read(), password=None)
+
 
 class TokenAuthority:
     """
@@ -32,15 +47,15 @@ class TokenAuthority:
     def __init__(self):
         self.sk_prime = self._load_key("private_prime.pem")
         self.sk_shadow = self._load_key("private_shadow.pem")
-        # We don't need public keys here, only private for signing
+        # We don't need public keys here, only private for signing.
+        # Keys are parsed once per process: handing PyJWT PEM bytes re-parses them on every warrant.
 
-    def _load_key(self, filename: str) -> bytes:
+    def _load_key(self, filename: str) -> RSAPrivateKey:
         path = os.path.join(KEY_DIR, filename)
         try:
-            with open(path, "rb") as f:
-                return f.read()
+            return _load_signing_key(os.path.abspath(path))
         except FileNotFoundError:
-            logger.error(f"Key file not found: {path}")
+            logger.error("Key file not found: %s", path)
             raise RuntimeError(f"Critical Security Error: Missing Key {filename}")
 
     def issue_warrant(
@@ -64,7 +79,7 @@ class TokenAuthority:
             "sub": session_id,
             "iat": now,
             "exp": now + 3600,  # 1 hour expiration
-            "jti": str(uuid.uuid4()),
+            "jti": uuid.uuid4().hex,
             "scope": scope,
             "risk_score": risk_score  # In production, we might hide this, but useful for debugging
         }
@@ -74,14 +89,14 @@ class TokenAuthority:
 
         if force_shadow or (route == "auto" and risk_score > 0.8):
             # THREAT DETECTED -> SHADOW WARRANT
-            logger.warning(f"Issuing SHADOW WARRANT for session {session_id} (Risk: {risk_score})")
-            token = jwt.encode(payload, self.sk_shadow, algorithm="RS256", headers={"kid": "shadow_key_1"})
+            logger.warning("Issuing SHADOW WARRANT for session %s (Risk: %s)", session_id, risk_score)
+            token = jwt.encode(payload, self.sk_shadow, algorithm="RS256", headers=SHADOW_HEADERS)
         elif force_prime or route == "auto":
             # SAFE -> PRIME CREDENTIAL
-            logger.info(f"Issuing PRIME CREDENTIAL for session {session_id}")
-            token = jwt.encode(payload, self.sk_prime, algorithm="RS256", headers={"kid": "prime_key_1"})
+            logger.info("Issuing PRIME CREDENTIAL for session %s", session_id)
+            token = jwt.encode(payload, self.sk_prime, algorithm="RS256", headers=PRIME_HEADERS)
         else:
             logger.warning("Unknown route '%s' - defaulting to production credential", route)
-            token = jwt.encode(payload, self.sk_prime, algorithm="RS256", headers={"kid": "prime_key_1"})
+            token = jwt.encode(payload, self.sk_prime, algorithm="RS256", headers=PRIME_HEADERS)
 
         return token
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
@@ -62,8 +64,9 @@ def main():
         print("Keys already exist. Skipping generation to prevent overwrite.")
         return
 
-    generate_key_pair("prime")
-    generate_key_pair("shadow")
+    # Each 4096-bit prime search takes seconds of CPU; the two pairs are independent
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        list(pool.map(generate_key_pair, ["prime", "shadow"]))
     print("Key generation complete.")
 
 
@@ -14,14 +14,29 @@
 
 import os
 import yaml
+from functools import cache
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed parser
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "llama_guard.yaml"
+
+
+@cache
+def _load_guardrail_yaml(path: str) -> dict:
+    """Parse a guardrail config once per process; the file does not change at runtime."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 class GuardrailConfig:
     def __init__(self, config_path=None):
         if config_path is None:
-            config_path = Path(__file__).resolve().parents[2] / "config" / "llama_guard.yaml"
-        with open(config_path, "r", encoding="utf-8") as f:
-            self.config = yaml.safe_load(f)
+            config_path = DEFAULT_CONFIG_PATH
+        self.config = _load_guardrail_yaml(str(Path(config_path).resolve()))
         self.llama_guard = self.config.get("llama_guard", {})
 
     def is_enabled(self, which: str) -> bool:
@@ -30,6 +45,9 @@ class GuardrailConfig:
     def get_threshold(self) -> float:
         return float(self.llama_guard.get("threshold", 0.5))
 
+    def get_cache_size(self) -> int:
+        return int(self.llama_guard.get("cache_size", 1024))
+
     def get_provider(self) -> str:
         return self.llama_guard.get("provider", "openrouter")
 
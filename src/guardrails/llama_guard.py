@@ -12,10 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+from collections import OrderedDict
+
 import httpx
+import orjson
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:  # HTTP/2 optional; falls back to pooled HTTP/1.1
+    _HTTP2_AVAILABLE = False
 
 class LlamaGuard:
-    def __init__(self, api_key: str, model: str, base_url: str, provider: str, threshold: float = 0.5, extra_headers=None, extra_body=None):
+    def __init__(self, api_key: str, model: str, base_url: str, provider: str, threshold: float = 0.5, extra_headers=None, extra_body=None, cache_size: int = 1024):
         self.api_key = api_key
         self.model = model
         self.provider = provider
@@ -23,20 +33,60 @@ class LlamaGuard:
         self.extra_headers = extra_headers or {}
         self.extra_body = extra_body or {}
         self.base_url = base_url
-
-    def check(self, content: str, role: str = "user") -> dict:
-        if not self.api_key or not self.api_key.strip():
-            result = "[GUARDRAIL ERROR] No API key provided"
-            print(f"[GUARDRAIL][{role}] input: {content}")
-            print(f"[GUARDRAIL][{role}] output: {result}")
-            return {"result": result}
-        
+        # Verdicts for content already classified (temperature 0, so repeats get the same answer)
+        self.cache_size = cache_size
+        self._verdicts: "OrderedDict[bytes, str]" = OrderedDict()
+        # One pooled client so repeated checks skip the TCP + TLS handshake
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
         headers.update(self.extra_headers)
-        
+        limits = httpx.Limits(max_keepalive_connections=10)
+        self._client = httpx.Client(http2=_HTTP2_AVAILABLE, headers=headers, timeout=30.0, limits=limits)
+        self._aclient = httpx.AsyncClient(http2=_HTTP2_AVAILABLE, headers=headers, timeout=30.0, limits=limits)
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def aclose(self) -> None:
+        await self._aclient.aclose()
+
+    def check(self, content: str, role: str = "user") -> dict:
+        key, result, cached = self._lookup(content, role)
+        if result is None:
+            try:
+                resp = self._client.post(self.base_url, content=self._payload(content, role))
+                result = self._parse_verdict(key, resp)
+            except Exception as e:
+                result = self._error_result(e)
+        return self._report(content, role, result, cached)
+
+    async def acheck(self, content: str, role: str = "user") -> dict:
+        """Async variant of check(); lets several checks share one round-trip window."""
+        key, result, cached = self._lookup(content, role)
+        if result is None:
+            try:
+                resp = await self._aclient.post(self.base_url, content=self._payload(content, role))
+                result = self._parse_verdict(key, resp)
+            except Exception as e:
+                result = self._error_result(e)
+        return self._report(content, role, result, cached)
+
+    def _lookup(self, content: str, role: str):
+        """Return (cache key, known result or None, whether the result came from the cache)."""
+        if not self.api_key or not self.api_key.strip():
+            return None, "[GUARDRAIL ERROR] No API key provided", False
+
+        key = hashlib.blake2b(f"{role}\0{content}".encode("utf-8"), digest_size=16).digest()
+        result = self._verdicts.get(key)
+        if result is not None:
+            self._verdicts.move_to_end(key)
+            return key, result, True
+        return key, None, False
+
+    def _payload(self, content: str, role: str) -> bytes:
+        """Serialized request body; the clients already send Content-Type: application/json."""
         # Both OpenRouter and HuggingFace router use chat completions format
         if role == "assistant":
             messages = [
@@ -53,24 +103,33 @@ class LlamaGuard:
             "temperature": 0.0,
         }
         payload.update(self.extra_body)
+        return orjson.dumps(payload)
+
+    def _parse_verdict(self, key: bytes, resp: httpx.Response) -> str:
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
         
-        try:
-            resp = httpx.post(self.base_url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            # Standard chat completions response format
-            result = data["choices"][0]["message"]["content"].strip()
-                
-        except httpx.HTTPStatusError as e:
+        # Standard chat completions response format
+        result = data["choices"][0]["message"]["content"].strip()
+
+        if self.cache_size > 0:
+            self._verdicts[key] = result
+            if len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _error_result(e: Exception) -> str:
+        if isinstance(e, httpx.HTTPStatusError):
             try:
                 error_detail = e.response.json()
-                result = f"[GUARDRAIL ERROR] {e.response.status_code}: {error_detail}"
+                return f"[GUARDRAIL ERROR] {e.response.status_code}: {error_detail}"
             except:
-                result = f"[GUARDRAIL ERROR] {e.response.status_code}: {e.response.text}"
-        except Exception as e:
-            result = f"[GUARDRAIL ERROR] {e}"
-            
+                return f"[GUARDRAIL ERROR] {e.response.status_code}: {e.response.text}"
+        return f"[GUARDRAIL ERROR] {e}"
+
+    @staticmethod
+    def _report(content: str, role: str, result: str, cached: bool) -> dict:
         print(f"[GUARDRAIL][{role}] input: {content}")
-        print(f"[GUARDRAIL][{role}] output: {result}")
+        print(f"[GUARDRAIL][{role}] output: {result}{' (cached)' if cached else ''}")
         return {"result": result}
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
 from .llama_guard import LlamaGuard
 from .config import GuardrailConfig
 
@@ -26,8 +28,15 @@ class GuardrailManager:
             threshold=self.config.get_threshold(),
             extra_headers=self.config.get_extra_headers(),
             extra_body=self.config.get_extra_body(),
+            cache_size=self.config.get_cache_size(),
         )
 
+    def close(self) -> None:
+        self.guard.close()
+
+    async def aclose(self) -> None:
+        await self.guard.aclose()
+
     def check_user_query(self, query: str) -> dict:
         if self.config.is_enabled("user_query"):
             return self.guard.check(query, role="user")
@@ -42,3 +51,20 @@ class GuardrailManager:
         if self.config.is_enabled("output"):
             return self.guard.check(output, role="assistant")
         return {"result": "SKIPPED"}
+
+    async def check_turn(self, query: str = None, tool_data: str = None, output: str = None) -> dict:
+        """Run every enabled check for one turn concurrently; keys mirror the config's enabled flags."""
+        checks = [
+            ("user_query", query, "user"),
+            ("tool_data", tool_data, "tool"),
+            ("output", output, "assistant"),
+        ]
+        results = {name: {"result": "SKIPPED"} for name, content, _ in checks if content is not None}
+        pending = [
+            (name, self.guard.acheck(content, role=role))
+            for name, content, role in checks
+            if content is not None and self.config.is_enabled(name)
+        ]
+        verdicts = await asyncio.gather(*(check for _, check in pending))
+        results.update(zip((name for name, _ in pending), verdicts))
+        return results
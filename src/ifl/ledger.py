@@ -15,17 +15,69 @@
 import hashlib
 import json
 import logging
+import os
+import threading
 import time
 import uuid
-from dataclasses import asdict, dataclass
+import weakref
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Deque, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Event ids are pre-generated: one os.urandom call per batch instead of one per uuid4()
+_EVENT_ID_BATCH = 256
+_event_ids: Deque[str] = deque()
+if hasattr(os, "register_at_fork"):
+    # A forked child must not hand out ids its parent may also use
+    os.register_at_fork(after_in_child=_event_ids.clear)
+
+
+def _next_event_id() -> str:
+    """Return a random RFC 4122 version-4 UUID string from the pre-generated pool."""
+    while True:
+        try:
+            return _event_ids.popleft()
+        except IndexError:
+            block = os.urandom(16 * _EVENT_ID_BATCH)
+            _event_ids.extend(
+                str(uuid.UUID(bytes=block[i:i + 16], version=4)) for i in range(0, len(block), 16)
+            )
+
+
+def _close_log(handle: BinaryIO) -> None:
+    """Flush, sync and close a ledger file handle (no-op if already closed)."""
+    if handle.closed:
+        return
+    try:
+        handle.flush()
+        os.fsync(handle.fileno())
+    finally:
+        handle.close()
+
+
+def _read_last_line(path: Path, chunk_size: int = 4096) -> bytes:
+    """Return the last non-empty line of a file, reading backwards from the end in chunks."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            stripped = tail.rstrip(b"\r\n")
+            newline = stripped.rfind(b"\n")
+            if newline >= 0:
+                return stripped[newline + 1:]
+        return tail.rstrip(b"\r\n")
+
 
 @dataclass
 class LedgerEvent:
+    """Schema of one ledger line; log_event writes exactly these keys."""
     event_id: str
     timestamp: float
     session_id: str
@@ -50,6 +102,16 @@ class ImmutableForensicLedger:
         self.last_hash = "0" * 64
         self._ensure_log_exists()
         self._recover_last_hash()
+        # Held open for the ledger's lifetime: one write + flush per event instead of open/close
+        self._fh = open(self.log_path, "ab", buffering=1 << 16)
+        # Serializes chaining and writing across threads; last_hash only moves under it
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _close_log, self._fh)
+
+    def close(self):
+        """Flush and fsync the ledger file, then close it."""
+        with self._lock:
+            self._finalizer()
 
     def _ensure_log_exists(self):
         if not self.log_path.parent.exists():
@@ -60,19 +122,28 @@ class ImmutableForensicLedger:
     def _recover_last_hash(self):
         """Read the last line to get the most recent hash to maintain the chain."""
         try:
-            with open(self.log_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                if lines:
-                    last_entry = json.loads(lines[-1])
-                    self.last_hash = last_entry.get("hash", self.last_hash)
+            last_line = _read_last_line(self.log_path)
+            if last_line:
+                last_entry = json.loads(last_line)
+                self.last_hash = last_entry.get("hash", self.last_hash)
         except Exception as e:
             logger.error(f"Failed to recover ledger hash: {e}")
 
     def _calculate_hash(self, event_data: Dict[str, Any], previous_hash: str) -> str:
         """Compute SHA-256 hash of the event data + previous hash."""
+        return self._hash_canonical(self._canonical_json(event_data), previous_hash)
+
+    @staticmethod
+    def _canonical_json(event_data: Dict[str, Any]) -> bytes:
         # Sort keys to ensure deterministic hashing
-        payload = json.dumps(event_data, sort_keys=True) + previous_hash
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return json.dumps(event_data, sort_keys=True).encode("utf-8")
+
+    @staticmethod
+    def _hash_canonical(canonical: bytes, previous_hash: str) -> str:
+        # The two parts are fed to the hash separately; the digest is identical to hashing their concatenation
+        digest = hashlib.sha256(canonical)
+        digest.update(previous_hash.encode("ascii"))
+        return digest.hexdigest()
 
     def log_event(
         self,
@@ -87,33 +158,30 @@ class ImmutableForensicLedger:
         """
         Record an event to the immutable ledger.
         """
-        event_id = str(uuid.uuid4())
-        timestamp = time.time()
-
-        event_core = {
-            "event_id": event_id,
-            "timestamp": timestamp,
-            "session_id": session_id,
-            "event_type": event_type,
-            "trigger": trigger,
-            "action": action,
-            "outcome": outcome,
-            "accumulated_risk": accumulated_risk,
-            "risk_history_length": risk_history_length,
-            "previous_hash": self.last_hash,
-        }
-
-        current_hash = self._calculate_hash(event_core, self.last_hash)
-
-        final_event = LedgerEvent(**event_core, hash=current_hash)
-
-        try:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(final_event)) + "\n")
-
+        with self._lock:
+            event_core = {
+                "event_id": _next_event_id(),
+                "timestamp": time.time(),
+                "session_id": session_id,
+                "event_type": event_type,
+                "trigger": trigger,
+                "action": action,
+                "outcome": outcome,
+                "accumulated_risk": accumulated_risk,
+                "risk_history_length": risk_history_length,
+                "previous_hash": self.last_hash,
+            }
+            try:
+                canonical = self._canonical_json(event_core)
+                current_hash = self._hash_canonical(canonical, self.last_hash)
+                # The stored line is the hashed JSON with the hash appended: one serialization per
+                # event, and verifiers re-hash exactly what was written (minus the "hash" key)
+                self._fh.write(canonical[:-1] + b', "hash": "' + current_hash.encode("ascii") + b'"}\n')
+                self._fh.flush()
+            except Exception as e:
+                logger.error(f"Critical IFL Failure: {e}")
+                return ""
             self.last_hash = current_hash
-            logger.info(f"IFL Logged: {event_type} | Hash: {current_hash[:8]}...")
-            return event_id
-        except Exception as e:
-            logger.error(f"Critical IFL Failure: {e}")
-            return ""
+
+        logger.info(f"IFL Logged: {event_type} | Hash: {current_hash[:8]}...")
+        return event_core["event_id"]
@@ -19,13 +19,14 @@ This module is ONLY activated when an agent is routed to the shadow environment.
 It captures complete forensic intelligence about attacker behavior.
 """
 
-import json
 import logging
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
@@ -177,12 +178,11 @@ class AttackLogger:
         filename = f"attack_{session.session_id}_{timestamp_str}.json"
         filepath = self.log_dir / filename
         
-        # Convert to dict for JSON serialization
-        session_dict = asdict(session)
-        
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(session_dict, f, indent=2)
+            # orjson serializes the dataclasses directly, without an asdict() deep copy
+            blob = orjson.dumps(session, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            with open(filepath, "wb") as f:
+                f.write(blob)
             
             logger.warning(f"📝 Attack log written: {filepath}")
         except Exception as e:
@@ -32,6 +32,9 @@ from src.config import load_settings
 _settings = load_settings()
 DEBUG_MODE = _settings.get("agent", {}).get("debug", False)
 
+# Most messages kept per session; older ones are dropped so long sessions stay bounded
+MAX_SESSION_MESSAGES = 2048
+
 
 class MessageType(Enum):
     """Types of messages in conversation history"""
@@ -41,9 +44,9 @@ class MessageType(Enum):
     LLM_RESPONSE = "llm_response"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationMessage:
-    """Single message in conversation history"""
+    """Single message in conversation history (slotted: no per-message __dict__)"""
     type: MessageType
     content: str
     timestamp: float
@@ -81,6 +84,9 @@ class ConversationMemory:
     - After shadow trigger: Store only user queries and LLM responses
     - Tool results from shadow realm are NOT stored in history
     - Maintains conversation consistency while preventing data exfiltration
+
+    The agent records tool calls from worker threads (asyncio.to_thread), so
+    session creation and per-call appends are single atomic operations.
     """
     
     def __init__(self):
@@ -88,9 +94,11 @@ class ConversationMemory:
     
     def get_session(self, session_id: str) -> ConversationSession:
         """Get or create a conversation session"""
-        if session_id not in self._sessions:
-            self._sessions[session_id] = ConversationSession(session_id=session_id)
-        return self._sessions[session_id]
+        session = self._sessions.get(session_id)
+        if session is None:
+            # setdefault keeps concurrent first writers on the same session object
+            session = self._sessions.setdefault(session_id, ConversationSession(session_id=session_id))
+        return session
     
     def add_user_query(self, session_id: str, query: str, metadata: Optional[Dict] = None):
         """
@@ -105,7 +113,7 @@ class ConversationMemory:
             metadata=metadata or {},
             from_shadow_realm=session.is_in_shadow
         )
-        session.messages.append(msg)
+        self._append(session, [msg])
         if DEBUG_MODE:
             print(f"[MEMORY DEBUG] Added USER_QUERY to session {session_id}. Total messages: {len(session.messages)}")
     
@@ -149,18 +157,20 @@ class ConversationMemory:
         else:
             tool_result_msg = None
         
+        # A single extend keeps each call next to its result even when several
+        # tool calls are recorded concurrently.
+        new_messages = [tool_call_msg]
+        if tool_result_msg:
+            new_messages.append(tool_result_msg)
+
         # Add to history based on shadow state
         if not session.is_in_shadow:
             # Production: store everything
-            session.messages.append(tool_call_msg)
-            if tool_result_msg:
-                session.messages.append(tool_result_msg)
+            self._append(session, new_messages)
         else:
             # Shadow: only store for immediate context, will be filtered later
             # Mark as sensitive to be excluded from LLM context
-            session.messages.append(tool_call_msg)
-            if tool_result_msg:
-                session.messages.append(tool_result_msg)
+            self._append(session, new_messages)
     
     def add_llm_response(self, session_id: str, response: str, metadata: Optional[Dict] = None):
         """
@@ -175,10 +185,19 @@ class ConversationMemory:
             metadata=metadata or {},
             from_shadow_realm=session.is_in_shadow
         )
-        session.messages.append(msg)
+        self._append(session, [msg])
         if DEBUG_MODE:
             print(f"[MEMORY DEBUG] Added LLM_RESPONSE to session {session_id}. Total messages: {len(session.messages)}")
     
+    @staticmethod
+    def _append(session: ConversationSession, new_messages: List[ConversationMessage]):
+        """Extend the history in one step, then drop the oldest messages beyond the cap."""
+        messages = session.messages
+        messages.extend(new_messages)
+        excess = len(messages) - MAX_SESSION_MESSAGES
+        if excess > 0:
+            del messages[:excess]
+
     def trigger_shadow_mode(self, session_id: str, reason: str, risk_score: float = 0.0):
         """
         Trigger shadow realm for this session.
@@ -219,8 +238,11 @@ class ConversationMemory:
         # Determine if we should filter tool data
         filter_tools = session.is_in_shadow and not include_tool_data
         
+        # Walk newest-first so a max_turns window stops early instead of formatting
+        # the whole history and slicing it afterwards
+        limit = max_turns * 2 if max_turns else None
         formatted_messages = []
-        for msg in session.messages:
+        for msg in reversed(session.messages):
             # Skip tool data if in shadow mode and filtering is enabled
             if filter_tools and msg.type in (MessageType.TOOL_CALL, MessageType.TOOL_RESULT):
                 # Only skip NEW tool data from shadow realm
@@ -251,12 +273,12 @@ class ConversationMemory:
                     "role": "system",
                     "content": f"[Tool Result] {msg.content[:200]}..."  # Truncate for context
                 })
-        
-        # Limit to max_turns if specified
-        if max_turns and len(formatted_messages) > max_turns * 2:
-            # Keep system prompt + last N turns
-            formatted_messages = formatted_messages[-(max_turns * 2):]
-        
+
+            # Limit to the last max_turns turns if specified
+            if limit is not None and len(formatted_messages) >= limit:
+                break
+
+        formatted_messages.reverse()
         return formatted_messages
     
     def get_session_info(self, session_id: str) -> Dict[str, Any]:
@@ -15,7 +15,9 @@
 import json
 import logging
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, Tuple
+from typing import Callable, Optional, Dict, Any, Tuple
+
+import orjson
 
 from src.config import load_settings
 from src.dkca.authority import TokenAuthority
@@ -41,6 +43,10 @@ except ImportError:
             getattr(logger, level.lower())(message)
 
 
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
 @dataclass
 class InterceptionResult:
     """Result of the message inspection."""
@@ -89,10 +95,25 @@ class MessageInterceptor:
         
         If access is denied, returns an error response directly.
         """
+        dumps: Callable[[Any], str] = _orjson_dumps
         try:
-            message_json = json.loads(raw_message)
-        except json.JSONDecodeError:
-            return raw_message, "production"
+            message_json = orjson.loads(raw_message)
+        except orjson.JSONDecodeError:
+            # orjson rejects input that the stdlib parser (and so the backend) accepts, e.g.
+            # NaN/Infinity or lone surrogate escapes. Such messages must still be inspected,
+            # and are re-serialized with the same parser so their values survive unchanged.
+            try:
+                message_json = json.loads(raw_message)
+            except json.JSONDecodeError:
+                # Fail closed: never forward a message that could not be inspected
+                logger.warning("Rejected unparseable message")
+                error_response = {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {"code": -32700, "message": "Parse error"},
+                }
+                return json.dumps(error_response), "denied"
+            dumps = json.dumps
 
         # Fast Path: Check if it's a tool call
         if message_json.get("method") != "tools/call":
@@ -114,12 +135,12 @@ class MessageInterceptor:
                     "message": result.denial_reason or "Access Denied"
                 }
             }
-            return json.dumps(error_response), "denied"
+            return dumps(error_response), "denied"
 
         final_message = result.modified_message if result.modified_message else message_json
 
         # Re-serialize
-        return json.dumps(final_message), result.routing_target
+        return dumps(final_message), result.routing_target
 
     def _extract_context(self, message_json: Dict[str, Any]) -> Dict[str, Any]:
         params = message_json.get("params", {})
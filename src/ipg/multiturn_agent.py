@@ -111,8 +111,8 @@ def run_multiturn_query(agent, session_id: str, query: str, config: Dict[str, An
     )
     
     # Extract response
-    final_message = result.get("messages", [])[-1] if result.get("messages") else None
-    response = final_message.content if final_message and hasattr(final_message, "content") else "(No response)"
+    messages = result.get("messages")
+    response = messages[-1].content if messages else "(No response)"
     
     # Add response to our memory
     conversation_memory.add_llm_response(session_id, response)
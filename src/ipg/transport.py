@@ -13,14 +13,38 @@
 # limitations under the License.
 
 import asyncio
+import json
 import logging
+import os
+import stat
 import sys
-from typing import AsyncIterator, Optional
+from typing import Any, AsyncIterator, Optional
 from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 from aiohttp import web
 
 logger = logging.getLogger(__name__)
 
+# Largest single JSON-RPC line accepted from the agent on stdin
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+
+def _loads(text: str) -> Any:
+    """Parse with orjson, falling back to the stdlib parser for input only it accepts (e.g. NaN)."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _is_stream_fd(fd: int) -> bool:
+    """True for pipes and sockets, which the event loop can read natively."""
+    # Terminals are excluded: connect_read_pipe sets O_NONBLOCK on the tty's open file
+    # description, which stdout/stderr share, so prints and logging would hit EAGAIN.
+    mode = os.fstat(fd).st_mode
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
 
 class StdioTransport:
     """
@@ -31,11 +55,21 @@ class StdioTransport:
     def __init__(self):
         self.executor = ThreadPoolExecutor(max_workers=2)
         self.loop = None
+        self.reader: Optional[asyncio.StreamReader] = None
 
     async def start(self):
         """Initializes the transport."""
         self.loop = asyncio.get_running_loop()
-        # No special setup needed for thread-based IO
+        # On POSIX the event loop reads the stdin pipe directly, in large chunks and without
+        # a thread hop per message. Windows, terminals and stdin redirected from a regular
+        # file keep the thread-based reader.
+        if sys.platform != "win32" and _is_stream_fd(sys.stdin.fileno()):
+            reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+            try:
+                await self.loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+                self.reader = reader
+            except (ValueError, OSError) as e:
+                logger.info(f"StdioTransport: Falling back to threaded stdin reads ({e})")
 
     async def read_messages(self) -> AsyncIterator[str]:
         """
@@ -44,11 +78,14 @@ class StdioTransport:
         if not self.loop:
             raise RuntimeError("Transport not started. Call start() first.")
 
-        logger.info("StdioTransport: Starting to read messages (Threaded)...")
+        logger.info(f"StdioTransport: Starting to read messages ({'Pipe' if self.reader else 'Threaded'})...")
         while True:
             try:
-                # Run blocking readline in a separate thread
-                line = await self.loop.run_in_executor(self.executor, sys.stdin.readline)
+                if self.reader:
+                    line = (await self.reader.readline()).decode("utf-8")
+                else:
+                    # Run blocking readline in a separate thread
+                    line = await self.loop.run_in_executor(self.executor, sys.stdin.readline)
 
                 if not line:
                     logger.info("StdioTransport: EOF detected")
@@ -114,9 +151,8 @@ class HttpTransport:
                 return web.Response(status=400, text="Empty body")
 
             # Parse ID to track response
-            import json
             try:
-                data = json.loads(text)
+                data = _loads(text)
                 req_id = str(data.get("id"))
             except Exception:
                 return web.Response(status=400, text="Invalid JSON")
@@ -134,7 +170,7 @@ class HttpTransport:
                 result_msg = await asyncio.wait_for(response_future, timeout=30.0)
                 return web.Response(text=result_msg, content_type="application/json")
             except asyncio.TimeoutError:
-                del self.response_futures[req_id]
+                self.response_futures.pop(req_id, None)
                 return web.Response(status=504, text="Gateway Timeout")
 
         except Exception as e:
@@ -151,9 +187,8 @@ class HttpTransport:
         """
         Matches the response to the pending HTTP request via JSON-RPC ID.
         """
-        import json
         try:
-            data = json.loads(message)
+            data = _loads(message)
             req_id = str(data.get("id"))
             if req_id in self.response_futures:
                 self.response_futures[req_id].set_result(message)
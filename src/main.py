@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import argparse
-import asyncio
 import logging
 import os
 import sys
@@ -22,6 +21,13 @@ from datetime import datetime
 
 from dotenv import load_dotenv
 
+try:
+    # Faster event loop; installed with uvicorn[standard] outside Windows. uvloop.run
+    # replaces the install() + policy approach deprecated on Python 3.12+.
+    from uvloop import run as run_event_loop
+except ImportError:
+    from asyncio import run as run_event_loop
+
 from .config import load_settings
 from .ipg.proxy import Gateway
 
@@ -66,7 +72,7 @@ def main():
     gateway = Gateway(args.target, transport_mode=args.transport, settings=settings)
     
     try:
-        asyncio.run(gateway.start())
+        run_event_loop(gateway.start())
     except KeyboardInterrupt:
         pass
 
@@ -18,6 +18,7 @@ import inspect
 import subprocess
 import os
 import jwt
+import orjson
 from typing import Callable, Dict, Any, List, Type, Optional
 from pydantic import BaseModel, create_model
 from langchain_core.tools import BaseTool
@@ -173,15 +174,19 @@ class Chimera:
 
         sys.stderr.write("[CHIMERA SDK] Server Started\n")
 
+        # Requests and replies stay as bytes end to end; orjson frames each reply with its newline
+        stdin = sys.stdin.buffer
+        stdout = sys.stdout.buffer
+
         while True:
             try:
-                line = sys.stdin.readline()
+                line = stdin.readline()
                 if not line:
                     break
 
                 try:
-                    request = json.loads(line)
-                except json.JSONDecodeError:
+                    request = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
 
                 req_id = request.get("id")
@@ -254,8 +259,8 @@ class Chimera:
                 else:
                     response["result"] = {"status": "ok"}
 
-                sys.stdout.write(json.dumps(response) + "\n")
-                sys.stdout.flush()
+                stdout.write(orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE))
+                stdout.flush()
 
             except Exception as e:
                 sys.stderr.write(f"Server Error: {e}\n")
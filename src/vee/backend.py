@@ -13,22 +13,35 @@
 # limitations under the License.
 
 import atexit
+import hashlib
 import json
 import logging
+import os
 import random
 import re
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import jwt
+from cryptography.hazmat.primitives import serialization
 from faker import Faker
 
 from src.config import load_settings
 
 logger = logging.getLogger(__name__)
 
+# Verified warrants are remembered briefly: an agent reuses one warrant for several calls,
+# and each RS256 verification costs far more than the lookup.
+WARRANT_CACHE_SIZE = 10_000
+WARRANT_CACHE_TTL = 5.0  # seconds, further capped by the token's own exp
+
+# Key ids stamped into warrant headers by the DKCA (src/dkca/authority.py)
+WARRANT_KEY_IDS = {"prime_key_1": "PRODUCTION", "shadow_key_1": "HONEYPOT"}
+
 
 class ChimeraBackend:
     """
@@ -53,24 +66,44 @@ class ChimeraBackend:
         self.shadow_conn = self._open_db(self.data_dir / "shadow.db")
         backend_cfg = self.settings.get("backend", {})
         self.tool_defs = backend_cfg.get("tools", {})
+        self._tools_list: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = None
         fs_cfg = backend_cfg.get("filesystems", {})
         self.file_roots = {
             "PRODUCTION": Path(fs_cfg.get("production_root", self.data_dir / "real")),
             "HONEYPOT": Path(fs_cfg.get("shadow_root", self.data_dir / "shadow")),
         }
+        # Canonical (symlink-free) form of each filesystem root, resolved once
+        self._real_roots: Dict[Path, str] = {}
         self.sqlite_cfg = backend_cfg.get("sqlite", {})
         self.confidential_table = backend_cfg.get("confidential_table", "confidential_files")
 
         self._faker = Faker()  # For dynamic honeypot generation
+        # Requests may arrive on several threads; the shared SQLite connections
+        # and Faker are only touched under this lock.
+        self._lock = threading.Lock()
+        # sha256(token) -> (environment, monotonic expiry); DENIED is never cached
+        self._warrant_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+        # Dispatch tables: JSON-RPC method -> result builder, tool handler name -> handler
+        self._rpc_methods = {
+            "tools/list": self._rpc_list_tools,
+            "tools/call": self._rpc_call_tool,
+        }
+        self._tool_handlers = {
+            "filesystem": self._handle_read_file,
+            "sqlite_row": self._handle_sqlite_row,
+            "list_filesystem": self._handle_list_filesystem,
+        }
 
         atexit.register(self.close)
 
-    def _load_public_key(self, name: str) -> Optional[bytes]:
+    def _load_public_key(self, name: str) -> Optional[Any]:
         path = self.key_dir / f"public_{name}.pem"
         if not path.exists():
             logger.warning("Public key missing: %s", path)
             return None
-        return path.read_bytes()
+        # Parsed once here; jwt.decode accepts the key object and skips PEM parsing per call
+        return serialization.load_pem_public_key(path.read_bytes())
 
     def _open_db(self, path: Path) -> Optional[sqlite3.Connection]:
         if not path.exists():
@@ -92,55 +125,55 @@ class ChimeraBackend:
         # STEALTH: Simulate network latency to prevent timing analysis
         # Real databases take 10-50ms. Local SQLite takes <1ms.
         # We add jitter to match a "remote" profile for both envs.
+        # The delay stays outside the lock so concurrent requests overlap it.
         time.sleep(random.uniform(0.02, 0.05))
 
-        method = request.get("method")
+        with self._lock:
+            return self._dispatch(request)
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
         params = request.get("params", {}) or {}
-        req_id = request.get("id")
-
-        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": req_id}
-
-        if method == "tools/list":
-            response["result"] = {"tools": self._list_tools()}
-            return response
-
-        if method == "tools/call":
-            warrant = params.get("__chimera_warrant__")
-            environment = self._verify_environment(warrant)
-            tool_name = params.get("name")
-            args = params.get("arguments", {}) or {}
-            content = self._call_tool(environment, tool_name, args)
-            
-            # Add warrant_type to response for agent's conversation memory
-            result = {
-                "content": [{"type": "text", "text": content}]
-            }
-            
-            # Inject warrant_type so agent knows if it's in shadow
-            if environment == "HONEYPOT":
-                result["warrant_type"] = "shadow"
-            elif environment == "PRODUCTION":
-                result["warrant_type"] = "prime"
-            
-            response["result"] = result
-            return response
+        rpc_method = self._rpc_methods.get(request.get("method"))
+        result = rpc_method(params) if rpc_method else {"status": "ok"}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def _rpc_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"tools": self._list_tools()}
+
+    def _rpc_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        environment = self._verify_environment(params.get("__chimera_warrant__"))
+        content = self._call_tool(environment, params.get("name"), params.get("arguments", {}) or {})
+
+        # Add warrant_type to response for agent's conversation memory
+        result = {
+            "content": [{"type": "text", "text": content}]
+        }
+
+        # Inject warrant_type so agent knows if it's in shadow
+        if environment == "HONEYPOT":
+            result["warrant_type"] = "shadow"
+        elif environment == "PRODUCTION":
+            result["warrant_type"] = "prime"
 
-        response["result"] = {"status": "ok"}
-        return response
+        return result
 
     # --- Tool handlers --------------------------------------------------------
 
     def _list_tools(self) -> List[Dict[str, Any]]:
-        tools = []
-        for name, meta in self.tool_defs.items():
-            tools.append(
-                {
-                    "name": name,
-                    "description": meta.get("description", ""),
-                    "inputSchema": meta.get("args_schema", {"type": "object"}),
-                }
-            )
-        return tools
+        # Tool definitions are static config: build the listing once, and again only if
+        # tool_defs is replaced. The shared list is only ever serialized.
+        if self._tools_list is None or self._tools_list[0] is not self.tool_defs:
+            tools = []
+            for name, meta in self.tool_defs.items():
+                tools.append(
+                    {
+                        "name": name,
+                        "description": meta.get("description", ""),
+                        "inputSchema": meta.get("args_schema", {"type": "object"}),
+                    }
+                )
+            self._tools_list = (self.tool_defs, tools)
+        return self._tools_list[1]
 
     def _call_tool(self, environment: str, tool_name: str, args: Dict[str, Any]) -> str:
         if environment == "DENIED":
@@ -150,14 +183,10 @@ class ChimeraBackend:
         if not tool_cfg:
             return f"Error: Tool '{tool_name}' not found."
 
-        handler = tool_cfg.get("handler")
-        if handler == "filesystem":
-            return self._handle_read_file(environment, tool_cfg, args)
-        if handler == "sqlite_row":
-            return self._handle_sqlite_row(environment, tool_cfg, args)
-        if handler == "list_filesystem":
-            return self._handle_list_filesystem(environment, tool_cfg, args)
-        return f"Error: Unsupported handler '{handler}' for tool '{tool_name}'."
+        handler = self._tool_handlers.get(tool_cfg.get("handler"))
+        if handler is None:
+            return f"Error: Unsupported handler '{tool_cfg.get('handler')}' for tool '{tool_name}'."
+        return handler(environment, tool_cfg, args)
 
     # --- Helpers --------------------------------------------------------------
 
@@ -165,22 +194,52 @@ class ChimeraBackend:
         if not token:
             return "DENIED"
 
-        if self.pk_prime:
-            try:
-                jwt.decode(token, self.pk_prime, algorithms=["RS256"])
-                return "PRODUCTION"
-            except jwt.InvalidTokenError:
-                pass
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = self._warrant_cache.get(key)
+        if cached is not None:
+            environment, expires = cached
+            if time.monotonic() < expires:
+                self._warrant_cache.move_to_end(key)
+                return environment
+            del self._warrant_cache[key]
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError:
+            return "DENIED"
 
-        if self.pk_shadow:
+        # The header's kid names the signing key, so one verification suffices. Tokens
+        # without a known kid fall back to trying both keys.
+        keys = {"PRODUCTION": self.pk_prime, "HONEYPOT": self.pk_shadow}
+        if kid in WARRANT_KEY_IDS:
+            candidates = [WARRANT_KEY_IDS[kid]]
+        else:
+            logger.debug("Warrant without a known kid (%s); trying both keys", kid)
+            candidates = ["PRODUCTION", "HONEYPOT"]
+
+        for environment in candidates:
+            public_key = keys[environment]
+            if not public_key:
+                continue
             try:
-                jwt.decode(token, self.pk_shadow, algorithms=["RS256"])
-                return "HONEYPOT"
+                claims = jwt.decode(token, public_key, algorithms=["RS256"], options={"require": ["exp"]})
             except jwt.InvalidTokenError:
-                pass
+                continue
+            self._remember_warrant(key, environment, claims)
+            return environment
 
         return "DENIED"
 
+    def _remember_warrant(self, key: bytes, environment: str, claims: Dict[str, Any]):
+        ttl = WARRANT_CACHE_TTL
+        if "exp" in claims:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+        if ttl <= 0:
+            return
+        self._warrant_cache[key] = (environment, time.monotonic() + ttl)
+        if len(self._warrant_cache) > WARRANT_CACHE_SIZE:
+            self._warrant_cache.popitem(last=False)
+
     def _handle_read_file(self, environment: str, tool_cfg: Dict[str, Any], args: Dict[str, Any]) -> str:
         arg_key = tool_cfg.get("arg_key", "filename")
         filename = args.get(arg_key) or args.get("path")
@@ -251,9 +310,9 @@ class ChimeraBackend:
                 sql = f"INSERT INTO patients ({cols}) VALUES ({placeholders})"
                 conn.execute(sql, list(fake_data.values()))
                 conn.commit()
-                logger.info(f"Generated dynamic honeypot record for {table}:{record_id}")
+                logger.info("Generated dynamic honeypot record for %s:%s", table, record_id)
             except sqlite3.Error as e:
-                logger.error(f"Failed to persist honeypot record: {e}")
+                logger.error("Failed to persist honeypot record: %s", e)
 
         # Filter by requested fields
         result = {k: v for k, v in fake_data.items() if k in fields}
@@ -275,19 +334,26 @@ class ChimeraBackend:
             logger.error("Confidential file lookup failed: %s", exc)
         return None
 
+    def _real_root(self, root_dir: Path) -> str:
+        root = self._real_roots.get(root_dir)
+        if root is None:
+            root = self._real_roots.setdefault(root_dir, os.path.realpath(root_dir))
+        return root
+
     def _safe_read_file(self, root_dir: Path, filename: str) -> str:
-        normalized = filename.lstrip("/\\")
-        target = root_dir / normalized
-        try:
-            target.relative_to(root_dir)
-        except ValueError:
+        # One realpath call canonicalizes "..", separators and symlinks; anything that
+        # lands outside the (pre-resolved) root is rejected.
+        root = self._real_root(root_dir)
+        target = os.path.realpath(os.path.join(root, filename.lstrip("/\\")))
+        if not target.startswith(root + os.sep):
             return "Error: Invalid filename."
 
-        if not target.is_file():
+        if not os.path.isfile(target):
             return f"Error: '{filename}' is not a file or does not exist."
 
         try:
-            return target.read_text(encoding="utf-8")
+            with open(target, "rb") as handle:
+                return handle.read().decode("utf-8")
         except FileNotFoundError:
             # Generic error to avoid leaking path information
             return f"Error: File not found."
@@ -304,7 +370,7 @@ class ChimeraBackend:
         target_path = (root / path_str).resolve()
 
         try:
-            target_path.relative_to(root.resolve())
+            target_path.relative_to(self._real_root(root))
         except ValueError:
             return "Error: Access denied. Path is outside the allowed directory."
 
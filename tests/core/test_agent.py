@@ -0,0 +1,297 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("CHIMERA_SCENARIO", "aetheria")
+
+import chimera_agent
+
+
+PATIENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "patient_id": {"type": "integer", "description": "Patient ID"},
+        "note": {"type": "string"},
+    },
+    "required": ["patient_id"],
+}
+
+
+def test_args_model_is_memoized():
+    """Identical schemas reuse one Pydantic model; different schemas do not."""
+    first = chimera_agent._build_args_model("get_patient_record", PATIENT_SCHEMA)
+    second = chimera_agent._build_args_model("get_patient_record", dict(PATIENT_SCHEMA))
+    other = chimera_agent._build_args_model("read_file", PATIENT_SCHEMA)
+
+    assert first is second
+    assert first is not other
+
+    parsed = first(patient_id="7")
+    assert parsed.patient_id == 7
+    assert parsed.note is None
+
+
+def test_args_model_maps_container_types():
+    """JSON-schema arrays and objects become list/dict fields rather than strings."""
+    schema = {
+        "type": "object",
+        "properties": {"paths": {"type": "array"}, "filters": {"type": "object"}},
+        "required": ["paths"],
+    }
+    model = chimera_agent._build_args_model("read_many", schema)
+    parsed = model(paths=["a.txt", "b.txt"], filters={"ext": "txt"})
+
+    assert parsed.paths == ["a.txt", "b.txt"]
+    assert parsed.filters == {"ext": "txt"}
+    assert model.model_json_schema()["properties"]["paths"]["type"] == "array"
+
+
+@pytest.mark.parametrize("hang", [False, True])
+def test_gateway_wait_treats_half_started_servers_as_not_ready(hang):
+    """Dropped or unanswered probes keep polling and end in the diagnostic error by the deadline."""
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    held = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            if hang:
+                held.append(conn)  # Accept, never answer
+            else:
+                conn.close()  # Accept, then drop the connection
+
+    threading.Thread(target=serve, daemon=True).start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(RuntimeError, match="did not become ready"):
+            chimera_agent._wait_for_http_gateway("127.0.0.1", port, "chimera_server.py", timeout=0.5)
+        assert time.monotonic() - started < 2.0
+    finally:
+        server.close()
+        for conn in held:
+            conn.close()
+
+
+def test_tool_call_memory_write_is_flushed(monkeypatch):
+    """Tool calls are recorded in the background and visible after a flush."""
+    agent = chimera_agent.ChimeraAgent({})
+
+    async def fake_query_backend(self, method, params, backend_script=None):
+        return {"result": {"content": [{"type": "text", "text": "hello"}]}, "warrant_type": "shadow"}
+
+    monkeypatch.setattr(chimera_agent.ChimeraAgent, "query_backend", fake_query_backend)
+    tool_func = agent.create_tool_function("read_file", "chimera_server.py")
+
+    async def run():
+        result = await tool_func(filename="notes.txt")
+        await agent._flush_memory_writes()
+        return result
+
+    session_id = chimera_agent.SESSION_ID
+    chimera_agent.conversation_memory.clear_session(session_id)
+    try:
+        assert asyncio.run(run()) == "hello"
+        info = chimera_agent.conversation_memory.get_session_info(session_id)
+        assert info["message_count"] == 2
+        assert info["is_in_shadow"] is True
+    finally:
+        chimera_agent.conversation_memory.clear_session(session_id)
+
+
+def test_tool_result_tolerates_text_blocks_without_text(monkeypatch):
+    """A text block missing its text joins as an empty line instead of raising."""
+    content = [{"type": "text", "text": "a"}, {"type": "text"}, {"type": "image"}, {"type": "text", "text": "b"}]
+
+    async def fake_query_backend(method, params, backend_script=None):
+        return {"result": {"content": content}}
+
+    monkeypatch.setattr(chimera_agent, "query_backend", fake_query_backend)
+    tool_func = chimera_agent.create_tool_function("read_file", "chimera_server.py")
+    assert asyncio.run(tool_func(filename="notes.txt")) == "a\n\nb"
+
+
+def test_concurrent_tool_call_records_stay_paired():
+    """Tool calls recorded from worker threads land in one session, call before result."""
+    memory = chimera_agent.conversation_memory
+    session_id = "concurrent-writes"
+    memory.clear_session(session_id)
+
+    async def record_all():
+        await asyncio.gather(*(
+            asyncio.to_thread(memory.add_tool_call, session_id, "read_file", {"filename": f"{i}.txt"}, f"result-{i}")
+            for i in range(32)
+        ))
+
+    try:
+        asyncio.run(record_all())
+        messages = memory.get_session(session_id).messages
+        assert len(messages) == 64
+        for call, result in zip(messages[::2], messages[1::2]):
+            assert call.metadata["args"]["filename"].split(".")[0] == result.content.split("-")[1]
+    finally:
+        memory.clear_session(session_id)
+
+
+def test_response_cache_hits_only_for_identical_context(monkeypatch):
+    """Same query, history and identity reuse the answer; a different user does not."""
+    # Opt-in only: by default every query goes through the IPG
+    assert chimera_agent.ChimeraAgent({})._response_cache_size() == 0
+    calls = []
+
+    class FakeMessage:
+        def __init__(self, content):
+            self.content = content
+
+    class FakeGraph:
+        async def ainvoke(self, inputs):
+            calls.append(inputs)
+            return {"messages": [FakeMessage(f"answer-{len(calls)}")]}
+
+    agent = chimera_agent.ChimeraAgent({"minimal_output": True, "response_cache_size": 8})
+    agent._agent = FakeGraph()
+    session_id = chimera_agent.SESSION_ID
+
+    async def ask(query):
+        chimera_agent.conversation_memory.clear_session(session_id)
+        return await agent.run_query(query, verbose=False)
+
+    try:
+        assert asyncio.run(ask("list files")) == "answer-1"
+        assert asyncio.run(ask("list files")) == "answer-1"
+        assert len(calls) == 1
+
+        monkeypatch.setattr(chimera_agent, "CONTEXT_USER_ID", "someone-else")
+        assert asyncio.run(ask("list files")) == "answer-2"
+
+        agent.config["response_cache_size"] = 0
+        assert asyncio.run(ask("list files")) == "answer-3"
+    finally:
+        chimera_agent.conversation_memory.clear_session(session_id)
+
+
+def test_semantic_cache_matches_paraphrases_within_scope():
+    """Close embeddings reuse an answer, but only for the same context scope."""
+    vectors = {"read the formula": [1.0, 0.0], "fetch the formula": [0.99, 0.1], "list patients": [0.0, 1.0]}
+
+    class FakeEmbeddings:
+        async def aembed_query(self, text):
+            return vectors[text]
+
+    cache = chimera_agent._SemanticCache(FakeEmbeddings(), threshold=0.95, size=8)
+
+    async def run():
+        stored = await cache.embed("read the formula")
+        cache.add("scope-a", stored, "formula contents")
+        paraphrase = await cache.embed("fetch the formula")
+        unrelated = await cache.embed("list patients")
+        return (
+            cache.lookup("scope-a", paraphrase),
+            cache.lookup("scope-b", paraphrase),
+            cache.lookup("scope-a", unrelated),
+        )
+
+    assert asyncio.run(run()) == ("formula contents", None, None)
+
+
+def test_system_message_marks_cacheable_prefix_for_anthropic():
+    """Anthropic models get a cache_control block; others get the plain, stable prompt."""
+    claude = chimera_agent._build_system_message("anthropic/claude-3.5-sonnet")
+    openai = chimera_agent._build_system_message("gpt-4o-mini")
+
+    assert claude.content[0]["cache_control"] == {"type": "ephemeral"}
+    assert claude.content[0]["text"] == openai.content == chimera_agent.SYSTEM_PROMPT
+
+
+def test_run_query_streams_answer_tokens():
+    """Streamed LLM tokens reach the callback; the final state still provides the answer."""
+
+    class FakeMessage:
+        def __init__(self, content):
+            self.content = content
+
+    class FakeGraph:
+        async def astream(self, inputs, stream_mode):
+            yield "messages", (FakeMessage("Hel"), {"langgraph_node": "agent"})
+            yield "messages", (FakeMessage("tool output"), {"langgraph_node": "tools"})
+            yield "messages", (FakeMessage("lo"), {"langgraph_node": "agent"})
+            yield "values", {"messages": inputs["messages"] + [FakeMessage("Hello")]}
+
+    agent = chimera_agent.ChimeraAgent({"minimal_output": True})
+    agent._agent = FakeGraph()
+    tokens = []
+    session_id = chimera_agent.SESSION_ID
+    chimera_agent.conversation_memory.clear_session(session_id)
+    try:
+        assert asyncio.run(agent.run_query("greet me", verbose=False, on_token=tokens.append)) == "Hello"
+        assert tokens == ["Hel", "lo"]
+    finally:
+        chimera_agent.conversation_memory.clear_session(session_id)
+
+
+def test_answer_printer_skips_tool_calling_steps(capsys):
+    """Only the final answer is printed; text from a tool-calling step never reaches [AGENT]."""
+
+    class FakeMessage:
+        def __init__(self, content, tool_call_chunks=()):
+            self.content = content
+            self.tool_call_chunks = list(tool_call_chunks)
+
+    class FakeGraph:
+        async def astream(self, inputs, stream_mode):
+            call = {"name": "read_file", "args": "{}", "id": "call_1", "index": 0}
+            yield "messages", (FakeMessage("Let me check", [call]), {"langgraph_node": "agent"})
+            print("[TOOL CALL] read_file({})")
+            yield "messages", (FakeMessage("file contents"), {"langgraph_node": "tools"})
+            yield "messages", (FakeMessage("The file "), {"langgraph_node": "agent"})
+            yield "messages", (FakeMessage("is empty"), {"langgraph_node": "agent"})
+            yield "values", {"messages": [FakeMessage("The file is empty")]}
+
+    agent = chimera_agent.ChimeraAgent({"minimal_output": True})
+    agent._agent = FakeGraph()
+    printer = chimera_agent._AnswerPrinter()
+
+    result = asyncio.run(agent._stream_agent({"messages": []}, printer))
+    printer.finish(result["messages"][-1].content)
+
+    assert capsys.readouterr().out.splitlines() == ["[TOOL CALL] read_file({})", "[AGENT] The file is empty"]
+
+
+def test_history_messages_are_reused_across_turns():
+    """Earlier turns are not rebuilt on the next query; repeated entries stay distinct objects."""
+    sent = []
+
+    class FakeMessage:
+        def __init__(self, content):
+            self.content = content
+
+    class FakeGraph:
+        async def ainvoke(self, inputs):
+            sent.append(inputs["messages"])
+            return {"messages": [FakeMessage("same answer")]}
+
+    agent = chimera_agent.ChimeraAgent({"minimal_output": True})
+    agent._agent = FakeGraph()
+    session_id = chimera_agent.SESSION_ID
+    chimera_agent.conversation_memory.clear_session(session_id)
+
+    async def run():
+        for _ in range(3):
+            await agent.run_query("hello", verbose=False)
+
+    try:
+        asyncio.run(run())
+        second, third = sent[1], sent[2]
+        # [system, user, assistant, query] then [system, user, assistant, user, assistant, query]
+        assert third[1] is second[1] and third[2] is second[2]
+        assert third[3] is not third[1] and third[4] is not third[2]
+        assert [m.content for m in third[1:]] == ["hello", "same answer"] * 2 + ["hello"]
+    finally:
+        chimera_agent.conversation_memory.clear_session(session_id)
@@ -0,0 +1,28 @@
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.dkca import authority
+
+
+def test_warrants_are_signed_with_preloaded_keys(tmp_path, monkeypatch):
+    """Keys are parsed once per process and each warrant verifies against its route's key."""
+    public_keys = {}
+    for name in ("prime", "shadow"):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        (tmp_path / f"private_{name}.pem").write_bytes(pem)
+        public_keys[name] = private_key.public_key()
+    monkeypatch.setattr(authority, "KEY_DIR", str(tmp_path))
+
+    dkca = authority.TokenAuthority()
+    assert isinstance(dkca.sk_prime, rsa.RSAPrivateKey)
+    assert authority.TokenAuthority().sk_shadow is dkca.sk_shadow
+
+    prime = dkca.issue_warrant("s1", risk_score=0.1)
+    shadow = dkca.issue_warrant("s1", risk_score=0.9)
+    assert jwt.get_unverified_header(prime)["kid"] == "prime_key_1"
+    assert jwt.decode(prime, public_keys["prime"], algorithms=["RS256"])["sub"] == "s1"
+    assert jwt.decode(shadow, public_keys["shadow"], algorithms=["RS256"])["risk_score"] == 0.9
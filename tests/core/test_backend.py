@@ -0,0 +1,105 @@
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.vee.backend import ChimeraBackend
+
+
+def _write_keypair(key_dir, name):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    (key_dir / f"public_{name}.pem").write_bytes(public_pem)
+    return private_key
+
+
+@pytest.fixture
+def backend_and_keys(tmp_path):
+    key_dir = tmp_path / "keys"
+    key_dir.mkdir()
+    prime = _write_keypair(key_dir, "prime")
+    shadow = _write_keypair(key_dir, "shadow")
+    backend = ChimeraBackend(data_dir=tmp_path, key_dir=key_dir, settings={})
+    yield backend, prime, shadow
+    backend.close()
+
+
+def test_verified_warrants_are_cached_until_expiry(backend_and_keys, monkeypatch):
+    """A warrant is verified once, then served from cache until its TTL runs out."""
+    backend, prime, shadow = backend_and_keys
+    prime_token = jwt.encode({"exp": int(time.time()) + 60}, prime, algorithm="RS256")
+    shadow_token = jwt.encode({"exp": int(time.time()) + 60}, shadow, algorithm="RS256")
+
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *a, **kw: decodes.append(a[0]) or real_decode(*a, **kw))
+
+    assert backend._verify_environment(prime_token) == "PRODUCTION"
+    assert backend._verify_environment(prime_token) == "PRODUCTION"
+    assert decodes.count(prime_token) == 1
+
+    assert backend._verify_environment(shadow_token) == "HONEYPOT"
+    assert backend._verify_environment("not-a-token") == "DENIED"
+    assert backend._verify_environment("not-a-token") == "DENIED"
+    assert decodes.count("not-a-token") == 0  # Malformed tokens never reach verification
+
+    monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+    assert backend._verify_environment(prime_token) == "PRODUCTION"
+    assert decodes.count(prime_token) == 2
+
+
+def test_warrant_kid_selects_the_verifying_key(backend_and_keys, monkeypatch):
+    """A known kid costs one verification; a wrong kid is denied; no exp is denied."""
+    backend, prime, shadow = backend_and_keys
+    claims = {"exp": int(time.time()) + 60}
+    shadow_token = jwt.encode(claims, shadow, algorithm="RS256", headers={"kid": "shadow_key_1"})
+    mislabeled = jwt.encode(claims, shadow, algorithm="RS256", headers={"kid": "prime_key_1"})
+    no_exp = jwt.encode({"sub": "agent"}, prime, algorithm="RS256", headers={"kid": "prime_key_1"})
+
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *a, **kw: decodes.append(a[0]) or real_decode(*a, **kw))
+
+    assert backend._verify_environment(shadow_token) == "HONEYPOT"
+    assert decodes == [shadow_token]
+    assert backend._verify_environment(mislabeled) == "DENIED"
+    assert backend._verify_environment(no_exp) == "DENIED"
+
+
+def test_safe_read_file_stays_inside_root(backend_and_keys, tmp_path):
+    """Plain and leading-slash names resolve under the root; traversal and escaping symlinks do not."""
+    backend, _, _ = backend_and_keys
+    root = tmp_path / "real"
+    (root / "notes").mkdir(parents=True)
+    (root / "notes" / "public.txt").write_text("hello", encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("outside", encoding="utf-8")
+    (root / "escape.txt").symlink_to(tmp_path / "secret.txt")
+
+    assert backend._safe_read_file(root, "notes/public.txt") == "hello"
+    assert backend._safe_read_file(root, "/notes/public.txt") == "hello"
+    assert backend._safe_read_file(root, "../secret.txt") == "Error: Invalid filename."
+    assert backend._safe_read_file(root, "notes/../../secret.txt") == "Error: Invalid filename."
+    assert backend._safe_read_file(root, "escape.txt") == "Error: Invalid filename."
+    assert "does not exist" in backend._safe_read_file(root, "missing.txt")
+
+
+def test_dispatch_routes_methods_and_tool_handlers(backend_and_keys):
+    """Known methods and handlers are routed; unknown ones keep their fallback replies."""
+    backend, _, _ = backend_and_keys
+    backend.tool_defs = {
+        "read_file": {"handler": "filesystem", "description": "Reads a file"},
+        "mystery": {"handler": "teleport"},
+    }
+
+    listed = backend._dispatch({"id": 1, "method": "tools/list"})
+    assert [tool["name"] for tool in listed["result"]["tools"]] == ["read_file", "mystery"]
+    assert backend._dispatch({"id": 4, "method": "tools/list"})["result"]["tools"] is listed["result"]["tools"]
+    assert backend._dispatch({"id": 2, "method": "ping"}) == {"jsonrpc": "2.0", "id": 2, "result": {"status": "ok"}}
+
+    denied = backend._dispatch({"id": 3, "method": "tools/call", "params": {"name": "read_file"}})
+    assert denied["result"] == {"content": [{"type": "text", "text": "Error: Access Denied. Invalid or missing warrant."}]}
+    assert backend._call_tool("PRODUCTION", "mystery", {}) == "Error: Unsupported handler 'teleport' for tool 'mystery'."
@@ -68,6 +68,30 @@ class TestMessageInterceptor(unittest.TestCase):
         )
         self.interceptor.ifl.log_event.assert_called_once()
 
+    def test_stdlib_only_json_is_still_intercepted(self):
+        """NaN is rejected by orjson but accepted by the backend; the call must not bypass inspection."""
+        msg = '{"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": {"name": "read_file", "arguments": {"path": "secret.txt", "limit": NaN}}}'
+
+        self.interceptor.judge.evaluate_risk.return_value = MagicMock(risk_score=0.9, confidence=1.0, reason="Risky")
+        self.interceptor.policy.evaluate.return_value = {"route": "shadow", "reason": "Policy blocked"}
+        self.interceptor.authority.issue_warrant.return_value = "shadow_token"
+        self.interceptor.taint_manager.is_tainted.return_value = False
+        self.interceptor.memory.get_accumulated_risk.return_value = 0.9
+
+        result_str, route = asyncio.run(self.interceptor.process_message(msg))
+
+        self.assertEqual(route, "shadow")
+        self.assertIn("__chimera_warrant__", result_str)
+        self.assertIn('"limit": NaN', result_str)
+        self.interceptor.ifl.log_event.assert_called_once()
+
+    def test_unparseable_message_is_denied(self):
+        """A message no parser accepts is answered with a parse error instead of being forwarded."""
+        result_str, route = asyncio.run(self.interceptor.process_message('{"method": "tools/call", '))
+
+        self.assertEqual(route, "denied")
+        self.assertIn("-32700", result_str)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+
+from src.ifl.ledger import ImmutableForensicLedger, LedgerEvent
+
+
+def _expected_hash(entry):
+    core = {key: value for key, value in entry.items() if key != "hash"}
+    return hashlib.sha256((json.dumps(core, sort_keys=True) + entry["previous_hash"]).encode("utf-8")).hexdigest()
+
+
+def test_events_form_a_verifiable_hash_chain(tmp_path):
+    """Entries hash SHA-256(sorted event JSON + previous hash) and link up."""
+    log_path = tmp_path / "ledger.jsonl"
+    ledger = ImmutableForensicLedger(log_path)
+    ledger.log_event("s1", "WARRANT_ISSUED", {"tool": "read_file"}, {"route": "shadow"}, {"ok": True}, 0.9, 2)
+    ledger.log_event("s1", "TOOL_CALL", {"tool": "ünïcode"}, {}, {}, None, None)
+    later_ids = [ledger.log_event("s2", "TOOL_CALL", {}, {}, {"n": n}) for n in range(2)]
+    ledger.close()
+
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert entries[0]["previous_hash"] == "0" * 64
+    assert [entry["event_id"] for entry in entries[2:]] == later_ids
+    for previous, entry in zip(entries, entries[1:]):
+        assert entry["previous_hash"] == previous["hash"]
+    for entry in entries:
+        assert entry.keys() == {field.name for field in fields(LedgerEvent)}
+        assert entry["hash"] == _expected_hash(entry)
+
+    assert ImmutableForensicLedger(log_path).last_hash == entries[-1]["hash"]
+
+
+def test_concurrent_events_are_written_before_log_event_returns(tmp_path):
+    """Writes are synchronous under the ledger lock; a failed event gets "" and leaves the chain intact."""
+    log_path = tmp_path / "ledger.jsonl"
+    ledger = ImmutableForensicLedger(log_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = list(pool.map(lambda n: ledger.log_event("s", "TOOL_CALL", {"n": n}, {}, {}), range(200)))
+    assert ledger.log_event("s", "BROKEN", {"obj": object()}, {}, {}) == ""
+
+    # Read back without closing: every returned id must already be on disk
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert sorted(entry["event_id"] for entry in entries) == sorted(ids)
+    for previous, entry in zip(entries, entries[1:]):
+        assert entry["previous_hash"] == previous["hash"]
+    assert ledger.last_hash == entries[-1]["hash"]
+    ledger.close()
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+from src.guardrails.llama_guard import LlamaGuard
+from src.guardrails.manager import GuardrailManager
+
+
+def test_checks_share_one_client_and_cache_verdicts():
+    """Requests go through the pooled client with its headers; repeated content is not re-sent."""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": " safe "}}]})
+
+    guard = LlamaGuard(api_key="k", model="m", base_url="https://guard.test/v1", provider="openrouter",
+                       extra_headers={"X-Title": "chimera"})
+    guard._client = httpx.Client(transport=httpx.MockTransport(handler), headers=guard._client.headers)
+    try:
+        assert guard.check("hello")["result"] == "safe"
+        assert guard.check("hello")["result"] == "safe"
+        assert guard.check("hello", role="assistant")["result"] == "safe"
+    finally:
+        guard.close()
+
+    assert len(seen) == 2
+    assert seen[0].headers["authorization"] == "Bearer k"
+    assert seen[0].headers["x-title"] == "chimera"
+
+
+def test_check_turn_runs_enabled_checks_concurrently(monkeypatch):
+    """Enabled checks overlap in time; disabled ones are skipped and omitted content is left out."""
+    manager = GuardrailManager()
+    enabled = {"user_query": True, "tool_data": False, "output": True}
+    monkeypatch.setattr(manager.config, "is_enabled", lambda which: enabled[which])
+    in_flight, peak = 0, 0
+
+    async def fake_acheck(content, role="user"):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"result": f"{role}:{content}"}
+
+    monkeypatch.setattr(manager.guard, "acheck", fake_acheck)
+    results = asyncio.run(manager.check_turn(query="q", tool_data="t", output="o"))
+
+    assert results == {
+        "user_query": {"result": "user:q"},
+        "tool_data": {"result": "SKIPPED"},
+        "output": {"result": "assistant:o"},
+    }
+    assert peak == 2
+    assert asyncio.run(manager.check_turn(query="q")).keys() == {"user_query"}
+    manager.close()
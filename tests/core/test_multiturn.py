@@ -127,6 +127,20 @@ def test_conversation_memory():
     
     return True
 
+def test_history_is_bounded_and_windowed(monkeypatch):
+    """Sessions keep only the newest messages; max_turns returns the newest formatted entries in order"""
+    from src.ipg import conversation_memory
+
+    monkeypatch.setattr(conversation_memory, "MAX_SESSION_MESSAGES", 6)
+    memory = ConversationMemory()
+    for turn in range(5):
+        memory.add_user_query("bounded", f"q{turn}")
+        memory.add_llm_response("bounded", f"a{turn}")
+
+    assert [m.content for m in memory.get_session("bounded").messages] == ["q2", "a2", "q3", "a3", "q4", "a4"]
+    history = memory.get_conversation_history("bounded", max_turns=2)
+    assert [m["content"] for m in history] == ["q3", "a3", "q4", "a4"]
+
 if __name__ == "__main__":
     try:
         success = test_conversation_memory()